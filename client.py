@@ -7,8 +7,33 @@ import sys
 from typing import Optional, List, Dict, Any, Union
 from contextlib import AsyncExitStack
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+def _extract_text(result) -> Optional[str]:
+    """Return the text payload of an MCP tool result, or None if it carries none"""
+    try:
+        return result.content[0].text
+    except (AttributeError, IndexError, TypeError):
+        return getattr(result, 'text', None)
+
+def _load_result(result):
+    """Decode an MCP tool result into the object the tool returned, where possible"""
+    # Prefer the structured payload so the JSON text does not have to be parsed again
+    structured = getattr(result, 'structuredContent', None)
+    if structured is not None:
+        # FastMCP wraps the tools' Dict return values as {"result": ...}
+        return structured.get("result", structured)
+    
+    text = _extract_text(result)
+    if text is None:
+        return result
+    try:
+        return _json.loads(text)
+    except json.JSONDecodeError:
+        return text
 
 async def main():
     # Parse command line arguments
@@ -27,6 +52,10 @@ async def main():
     # If dashboard is requested, we need to save the results
     needs_save = args.save or args.dashboard
 
+    # Imported here so that --help and argument errors don't pay for the MCP import chain
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    
     # Connect to the MCP server
     async with AsyncExitStack() as exit_stack:
         # Configure server parameters
@@ -49,7 +78,7 @@ async def main():
             if args.host:
                 # Get entries matching the host
                 if needs_save:
-                    result = await session.call_tool(
+                    result = _load_result(await session.call_tool(
                         "parse_and_save_charles_log_by_host",
                         {
                             "file_path": args.file_path,
@@ -58,9 +87,9 @@ async def main():
                             "format_type": args.format,
                             "match_type": args.match_type
                         }
-                    )
+                    ))
                 else:
-                    result = await session.call_tool(
+                    result = _load_result(await session.call_tool(
                         "parse_charles_log_by_host",
                         {
                             "file_path": args.file_path,
@@ -68,7 +97,7 @@ async def main():
                             "format_type": args.format,
                             "match_type": args.match_type
                         }
-                    )
+                    ))
                 
                 # Print the result for matching host
                 if isinstance(result, dict):
@@ -80,7 +109,7 @@ async def main():
                 
                 # Get entries not matching the host
                 if needs_save:
-                    result_exclude = await session.call_tool(
+                    result_exclude = _load_result(await session.call_tool(
                         "parse_and_save_charles_log_exclude_host",
                         {
                             "file_path": args.file_path,
@@ -89,9 +118,9 @@ async def main():
                             "format_type": args.format,
                             "match_type": args.match_type
                         }
-                    )
+                    ))
                 else:
-                    result_exclude = await session.call_tool(
+                    result_exclude = _load_result(await session.call_tool(
                         "parse_charles_log_by_host",
                         {
                             "file_path": args.file_path,
@@ -99,7 +128,7 @@ async def main():
                             "format_type": args.format,
                             "match_type": args.match_type
                         }
-                    )
+                    ))
                 
                 # Print the result for non-matching host
                 if isinstance(result_exclude, dict):
@@ -113,12 +142,12 @@ async def main():
                 if args.dashboard:
                     if isinstance(result, dict) and "output_file" in result:
                         print("\nOpening dashboard for matching entries...")
-                        dashboard_result = await session.call_tool(
+                        dashboard_result = _load_result(await session.call_tool(
                             "view_charles_log_dashboard",
                             {
                                 "file_path": result["output_file"]
                             }
-                        )
+                        ))
                         if isinstance(dashboard_result, dict):
                             print(json.dumps(dashboard_result, indent=2))
                         else:
@@ -126,12 +155,12 @@ async def main():
                     
                     if isinstance(result_exclude, dict) and "output_file" in result_exclude:
                         print("\nOpening dashboard for non-matching entries...")
-                        dashboard_result = await session.call_tool(
+                        dashboard_result = _load_result(await session.call_tool(
                             "view_charles_log_dashboard",
                             {
                                 "file_path": result_exclude["output_file"]
                             }
-                        )
+                        ))
                         if isinstance(dashboard_result, dict):
                             print(json.dumps(dashboard_result, indent=2))
                         else:
@@ -140,22 +169,22 @@ async def main():
             # No filtering, process entire file
             else:
                 if needs_save:
-                    result = await session.call_tool(
+                    result = _load_result(await session.call_tool(
                         "parse_and_save_charles_log",
                         {
                             "file_path": args.file_path,
                             "output_dir": args.output_dir,
                             "format_type": args.format
                         }
-                    )
+                    ))
                 else:
-                    result = await session.call_tool(
+                    result = _load_result(await session.call_tool(
                         "parse_charles_log",
                         {
                             "file_path": args.file_path,
                             "format_type": args.format
                         }
-                    )
+                    ))
                 
                 # Print the result
                 if isinstance(result, dict):
@@ -165,12 +194,12 @@ async def main():
                 
                 # Open dashboard if requested
                 if args.dashboard and isinstance(result, dict) and "output_file" in result:
-                    dashboard_result = await session.call_tool(
+                    dashboard_result = _load_result(await session.call_tool(
                         "view_charles_log_dashboard",
                         {
                             "file_path": result["output_file"]
                         }
-                    )
+                    ))
                     if isinstance(dashboard_result, dict):
                         print(json.dumps(dashboard_result, indent=2))
                     else:
@@ -1,105 +1,143 @@
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def analyze_structure(data, file_name):
-    print(f"\nAnalyzing structure of {file_name}:")
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def _shape_of(data):
+    # Describe the top level the way analyze_structure prints it
     if isinstance(data, dict):
-        print("Top-level keys:", list(data.keys()))
-    elif isinstance(data, list):
-        print("Top-level is a list with", len(data), "items")
-        if data:
-            print("First item keys:", list(data[0].keys()) if isinstance(data[0], dict) else "not a dictionary")
+        return {'type': dict, 'keys': list(data.keys())}
+    if isinstance(data, list):
+        return {'type': list, 'count': len(data), 'first_item': data[0] if data else None}
+    return {'type': type(data)}
+
+def scan_file(file_path):
+    # Parse the file once; the top-level shape and the path index of its 'data' entries come from the same pass
+    with open(file_path, 'rb') as f:
+        if ijson is None:
+            data = _json.loads(f.read())
+            entries = data.get('data', []) if isinstance(data, dict) else []
+            return _shape_of(data), index_by_path(entries if isinstance(entries, list) else [])
+        
+        first = f.read(64).lstrip()[:1]
+        f.seek(0)
+        if first == b'{':
+            # Top-level values are built one at a time, so only the 'data' list is ever held whole
+            top_keys = []
+            idx = {}
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                top_keys.append(key)
+                if key == 'data':
+                    idx = index_by_path(value if isinstance(value, list) else [])
+            return {'type': dict, 'keys': top_keys}, idx
+        if first == b'[':
+            count = 0
+            first_item = None
+            for item in ijson.items(f, 'item', use_float=True):
+                if count == 0:
+                    first_item = item
+                count += 1
+            return {'type': list, 'count': count, 'first_item': first_item}, {}
+        # Any other document is a single scalar, so parsing it costs nothing
+        return _shape_of(next(ijson.items(f, '', use_float=True), None)), {}
+
+def analyze_structure(shape, file_name):
+    print(f"\nAnalyzing structure of {file_name}:")
+    if shape['type'] is dict:
+        print("Top-level keys:", shape['keys'])
+    elif shape['type'] is list:
+        print("Top-level is a list with", shape['count'], "items")
+        if shape['count']:
+            first_item = shape['first_item']
+            print("First item keys:", list(first_item.keys()) if isinstance(first_item, dict) else "not a dictionary")
     else:
-        print("Unexpected top-level type:", type(data))
+        print("Unexpected top-level type:", shape['type'])
+
+def index_by_path(entries):
+    # Group entries by path once so every later lookup is a dict access
+    idx = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            idx.setdefault(entry.get('path'), []).append(entry)
+    return idx
 
-def find_kyc_endpoints(data, file_name):
+def find_kyc_endpoints(idx, file_name):
     print(f"\nSearching for KYC endpoints in {file_name}:")
     
-    def search_in_item(item):
-        if isinstance(item, dict):
-            path = item.get('path', '')
-            if isinstance(path, str) and 'kyc' in path.lower():
+    for path, items in idx.items():
+        if isinstance(path, str) and 'kyc' in path.lower():
+            for item in items:
                 print(f"\nFound endpoint: {path}")
                 print("Method:", item.get('method', 'N/A'))
                 if 'request' in item:
                     print("Request body:", item['request'].get('body', 'No body'))
-                return True
-        return False
-    
-    if isinstance(data, dict):
-        # Try to find entries in various possible locations
-        for key, value in data.items():
-            if isinstance(value, list):
-                for item in value:
-                    search_in_item(item)
-    elif isinstance(data, list):
-        for item in data:
-            search_in_item(item)
 
-def get_endpoint_instances(data, target_path):
-    instances = []
-    if isinstance(data, dict):
-        entries = data.get('data', [])
-        if isinstance(entries, list):
-            for entry in entries:
-                if isinstance(entry, dict) and entry.get('path') == target_path:
-                    instances.append(entry)
-    return instances
-
-def compare_endpoints(file1_path, file2_path, target_path):
-    # Read files
-    with open(file1_path, 'r') as f:
-        data1 = json.load(f)
-    with open(file2_path, 'r') as f:
-        data2 = json.load(f)
-    
-    # Get all instances of the endpoint from both files
-    instances1 = get_endpoint_instances(data1, target_path)
-    instances2 = get_endpoint_instances(data2, target_path)
-    
-    print(f"\nEndpoint: {target_path}")
-    print(f"Found {len(instances1)} instances in file 1")
-    print(f"Found {len(instances2)} instances in file 2")
-    
-    print("\nDetailed comparison:")
-    
-    # Compare each instance
-    for i, inst1 in enumerate(instances1):
-        print(f"\nFile 1 - Instance {i+1}:")
-        print(f"Method: {inst1.get('method')}")
-        print(f"Request body: {inst1.get('request', {}).get('body')}")
-        print(f"Status: {inst1.get('status')}")
-        print(f"Timestamp: {inst1.get('timestamp')}")
-    
-    print("\n" + "="*50 + "\n")
-    
-    for i, inst2 in enumerate(instances2):
-        print(f"\nFile 2 - Instance {i+1}:")
-        print(f"Method: {inst2.get('method')}")
-        print(f"Request body: {inst2.get('request', {}).get('body')}")
-        print(f"Status: {inst2.get('status')}")
-        print(f"Timestamp: {inst2.get('timestamp')}")
+def compare_endpoints(idx1, idx2, target_paths):
+    # The path index makes each target a dict lookup, so any number of endpoints costs no extra scan
+    for target_path in dict.fromkeys(target_paths):
+        # Get all instances of the endpoint from both files
+        instances1 = idx1.get(target_path, [])
+        instances2 = idx2.get(target_path, [])
+        
+        print(f"\nEndpoint: {target_path}")
+        print(f"Found {len(instances1)} instances in file 1")
+        print(f"Found {len(instances2)} instances in file 2")
+        
+        print("\nDetailed comparison:")
+        
+        # Compare each instance
+        for i, inst1 in enumerate(instances1):
+            print(f"\nFile 1 - Instance {i+1}:")
+            print(f"Method: {inst1.get('method')}")
+            print(f"Request body: {inst1.get('request', {}).get('body')}")
+            print(f"Status: {inst1.get('status')}")
+            print(f"Timestamp: {inst1.get('timestamp')}")
+        
+        print("\n" + "="*50 + "\n")
+        
+        for i, inst2 in enumerate(instances2):
+            print(f"\nFile 2 - Instance {i+1}:")
+            print(f"Method: {inst2.get('method')}")
+            print(f"Request body: {inst2.get('request', {}).get('body')}")
+            print(f"Status: {inst2.get('status')}")
+            print(f"Timestamp: {inst2.get('timestamp')}")
 
 # Run analysis
 file1 = "/Users/pranjulraizada/NewAIProject/git/mcp-charles-shared/output/Pranjul_detailed.json"
 file2 = "/Users/pranjulraizada/NewAIProject/git/mcp-charles-shared/output/Pranjul_detailed_1.json"
-target_endpoint = "/api/v1/merchantprofile/kyc-banks"
+target_endpoints = ["/api/v1/merchantprofile/kyc-banks"]
 
-try:
-    with open(file1, 'r') as f:
-        data1 = json.load(f)
-        analyze_structure(data1, "File 1")
-        find_kyc_endpoints(data1, "File 1")
-except Exception as e:
-    print(f"\nError reading File 1: {str(e)}")
+# Each file is parsed once; the structure report, the KYC search and the comparison all share that result.
+# Both files are read in parallel so one file's disk reads overlap the other's decoding.
+idx1 = {}
+idx2 = {}
 
-try:
-    with open(file2, 'r') as f:
-        data2 = json.load(f)
-        analyze_structure(data2, "File 2")
-        find_kyc_endpoints(data2, "File 2")
-except Exception as e:
-    print(f"\nError reading File 2: {str(e)}")
+with ThreadPoolExecutor(2) as executor:
+    scan1_future = executor.submit(scan_file, file1)
+    scan2_future = executor.submit(scan_file, file2)
+    
+    try:
+        shape1, idx1 = scan1_future.result()
+        analyze_structure(shape1, "File 1")
+        find_kyc_endpoints(idx1, "File 1")
+    except Exception as e:
+        print(f"\nError reading File 1: {str(e)}")
+    
+    try:
+        shape2, idx2 = scan2_future.result()
+        analyze_structure(shape2, "File 2")
+        find_kyc_endpoints(idx2, "File 2")
+    except Exception as e:
+        print(f"\nError reading File 2: {str(e)}")
 
-compare_endpoints(file1, file2, target_endpoint) 
\ No newline at end of file
+compare_endpoints(idx1, idx2, target_endpoints) 
\ No newline at end of file
@@ -2,14 +2,20 @@
 import asyncio
 import argparse
 import json
+from collections import Counter
 from typing import Dict, List, Optional
 from contextlib import AsyncExitStack
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from client import _load_result
 
-async def process_large_file(session, file_path: str, output_path: Optional[str] = None):
-    """Process a large Charles log file in chunks"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+async def process_large_file(session, file_path: str, output_path: Optional[str] = None,
+                             chunk_size: int = 16000000, pretty: bool = False):
+    """Process a large Charles log file in chunks of chunk_size bytes"""
     print(f"Processing large file: {file_path}")
     
     # Initialize variables
@@ -19,105 +25,99 @@ async def process_large_file(session, file_path: str, output_path: Optional[str]
     chunks_processed = 0
     
     # Statistics
-    methods = {}
-    status_codes = {}
-    hosts = {}
+    methods = Counter()
+    status_codes = Counter()
+    hosts = Counter()
     
-    # Process in chunks
-    while has_more:
+    def fetch_chunk(chunk_offset: int) -> asyncio.Task:
         # Call MCP tool to read chunk
-        result = await session.call_tool(
+        return asyncio.create_task(session.call_tool(
             "read_large_file_part",
             {
                 "file_path": file_path,
-                "start_offset": offset,
-                "length": 2000000  # 2MB chunks
+                "start_offset": chunk_offset,
+                "length": chunk_size,
+                # Only methods, status codes and hosts are tallied
+                "include_bodies": False
             }
-        )
-        
-        # Extract data from CallToolResult
-        result_data = None
-        if hasattr(result, 'content'):
-            content = result.content
-            # Handle TextContent objects which might be in a list
-            if isinstance(content, list) and len(content) > 0:
-                if hasattr(content[0], 'text'):
-                    result_data = json.loads(content[0].text)
-            elif hasattr(content, 'text'):
-                result_data = json.loads(content.text)
-            elif isinstance(content, (dict, str)):
-                result_data = content if isinstance(content, dict) else json.loads(content)
-        elif hasattr(result, 'text'):
-            result_data = json.loads(result.text)
-        
-        # If we couldn't parse the result, skip this chunk
-        if result_data is None:
-            print(f"Error: Could not parse result: {result}")
-            return
-        
-        # Check for errors
-        if "error" in result_data:
-            print(f"Error: {result_data['error']}")
-            return
-        
-        # Process entries
-        entries = result_data.get("entries", [])
-        entry_count = len(entries)
-        total_entries += entry_count
-        chunks_processed += 1
-        
-        # Update statistics
-        for entry in entries:
-            # Count methods
-            method = None
-            if "request" in entry and isinstance(entry["request"], dict):
-                method = entry["request"].get("method")
-            if not method:
-                method = "UNKNOWN"
-            methods[method] = methods.get(method, 0) + 1
+        ))
+    
+    # Process in chunks, fetching the next chunk while the current one is aggregated
+    pending = fetch_chunk(offset)
+    try:
+        while has_more:
+            result = await pending
+            pending = None
             
-            # Count status codes
-            status = None
-            if "status" in entry:
-                status = entry["status"]
-            elif "response" in entry and isinstance(entry["response"], dict):
-                status = entry["response"].get("status")
+            # Extract data from CallToolResult
+            result_data = _load_result(result)
             
-            status_str = str(status) if status is not None else "UNKNOWN"
-            status_codes[status_str] = status_codes.get(status_str, 0) + 1
+            # If we couldn't parse the result, skip this chunk
+            if not isinstance(result_data, dict):
+                print(f"Error: Could not parse result: {result}")
+                return
             
-            # Count hosts
-            host = entry.get("host")
-            if not host:
-                host = "UNKNOWN"
-            hosts[host] = hosts.get(host, 0) + 1
-        
-        # Get metadata
-        metadata = result_data.get("metadata", {})
-        file_size = metadata.get("file_size", 0)
-        read_bytes = metadata.get("read_bytes", 0)
-        has_more = metadata.get("has_more", False)
-        file_format = metadata.get("format", "unknown")
-        
-        # Update offset for next chunk (use a default value if None)
-        next_offset = metadata.get("next_offset")
-        if next_offset is not None:
-            offset = next_offset
-        else:
-            # If next_offset is None, calculate based on read_bytes (which defaults to 0 if None)
-            offset = offset + (read_bytes or 0)
+            # Check for errors
+            if "error" in result_data:
+                print(f"Error: {result_data['error']}")
+                return
             
-            # If we couldn't determine the next offset, break to avoid infinite loops
-            if read_bytes == 0 or read_bytes is None:
-                print("Warning: Could not determine next read position, stopping.")
-                has_more = False
-        
-        # Print progress (handle None values)
-        if file_size and file_size > 0:
-            progress = (offset / file_size) * 100
-        else:
-            progress = 0
-        print(f"Chunk {chunks_processed}: {entry_count} entries, format: {file_format}, {progress:.2f}% complete")
+            # Get metadata
+            md_get = result_data.get("metadata", {}).get
+            file_size, read_bytes, has_more, file_format, next_offset = (
+                md_get("file_size", 0),
+                md_get("read_bytes", 0),
+                md_get("has_more", False),
+                md_get("format", "unknown"),
+                md_get("next_offset"),
+            )
+            
+            # Update offset for next chunk (use a default value if None)
+            if next_offset is not None:
+                offset = next_offset
+            else:
+                # If next_offset is None, calculate based on read_bytes (which defaults to 0 if None)
+                offset = offset + (read_bytes or 0)
+                
+                # If we couldn't determine the next offset, break to avoid infinite loops
+                if read_bytes == 0 or read_bytes is None:
+                    print("Warning: Could not determine next read position, stopping.")
+                    has_more = False
+            
+            # Start reading the next chunk before aggregating this one
+            if has_more:
+                pending = fetch_chunk(offset)
+            
+            # Process entries
+            entries = result_data.get("entries", [])
+            entry_count = len(entries)
+            total_entries += entry_count
+            chunks_processed += 1
+            
+            # Update statistics
+            methods.update(
+                (entry.get("request") or {}).get("method") or "UNKNOWN"
+                for entry in entries
+            )
+            status_codes.update(
+                str(status) if status is not None else "UNKNOWN"
+                for status in (
+                    entry["status"] if "status" in entry else (entry.get("response") or {}).get("status")
+                    for entry in entries
+                )
+            )
+            hosts.update(entry.get("host") or "UNKNOWN" for entry in entries)
+            
+            # Print progress (handle None values)
+            if file_size and file_size > 0:
+                progress = (offset / file_size) * 100
+            else:
+                progress = 0
+            print(f"Chunk {chunks_processed}: {entry_count} entries, format: {file_format}, {progress:.2f}% complete")
+    finally:
+        # Drop a speculative fetch that is no longer needed
+        if pending is not None:
+            pending.cancel()
     
     # Print final statistics
     print("\nProcessing complete!")
@@ -126,17 +126,17 @@ async def process_large_file(session, file_path: str, output_path: Optional[str]
     
     if methods:
         print("\nTop request methods:")
-        for method, count in sorted(methods.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for method, count in methods.most_common(5):
             print(f"  {method}: {count}")
     
     if status_codes:
         print("\nTop status codes:")
-        for code, count in sorted(status_codes.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for code, count in status_codes.most_common(5):
             print(f"  {code}: {count}")
     
     if hosts:
         print("\nTop hosts:")
-        for host, count in sorted(hosts.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for host, count in hosts.most_common(5):
             print(f"  {host}: {count}")
     
     # Save results if output path provided
@@ -144,13 +144,18 @@ async def process_large_file(session, file_path: str, output_path: Optional[str]
         stats = {
             "total_entries": total_entries,
             "chunks_processed": chunks_processed,
-            "request_methods": methods,
-            "status_codes": status_codes,
-            "hosts": hosts
+            "request_methods": dict(methods),
+            "status_codes": dict(status_codes),
+            "hosts": dict(hosts)
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(stats, f, indent=2)
+        # Compact output unless a human-readable file was asked for
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2 if pretty else 0))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(stats, f, indent=2 if pretty else None)
         
         print(f"\nStatistics saved to: {output_path}")
 
@@ -159,8 +164,17 @@ async def main():
     parser = argparse.ArgumentParser(description='Process large Charles log files in chunks')
     parser.add_argument('file_path', help='Path to the Charles log file (.chlsj)')
     parser.add_argument('--output', help='Path to save summary statistics')
+    parser.add_argument('--chunk-size', type=int, default=16000000,
+                        help='Bytes requested per read_large_file_part call (default: 16000000). '
+                             'Larger chunks mean fewer MCP round trips; peak memory grows with the '
+                             'chunk plus its decoded entries')
+    parser.add_argument('--pretty', action='store_true', help='Indent the saved statistics file')
     args = parser.parse_args()
 
+    # Imported here so that --help and argument errors don't pay for the MCP import chain
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    
     # Connect to the MCP server
     async with AsyncExitStack() as exit_stack:
         # Configure server parameters
@@ -179,7 +193,7 @@ async def main():
         await session.initialize()
         
         # Process the large file
-        await process_large_file(session, args.file_path, args.output)
+        await process_large_file(session, args.file_path, args.output, args.chunk_size, args.pretty)
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -5,6 +5,11 @@ import sys
 import argparse
 from server import compare_api_structures
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def main():
     parser = argparse.ArgumentParser(description='Compare API structures between Charles log files')
     parser.add_argument('--file_paths', type=str, required=True, help='JSON string array of file paths to compare')
@@ -29,7 +34,20 @@ def main():
         result = compare_api_structures(file_paths, args.output_dir, args.comparison_level)
         
         # Print the result
-        print(json.dumps(result, indent=2))
+        encoded = None
+        if orjson is not None:
+            try:
+                encoded = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+            except TypeError:
+                # orjson rejects some values the stdlib accepts, such as integers over 64 bits or non-str keys
+                pass
+        if encoded is not None:
+            # Write the UTF-8 bytes straight to stdout instead of decoding and re-encoding them
+            sys.stdout.buffer.write(encoded)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
+        else:
+            print(json.dumps(result, indent=2))
         
         # Exit with appropriate status code
         if "error" in result:
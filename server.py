@@ -1,19 +1,101 @@
 #!/usr/bin/env python3
+import copy
+import inspect
 import json
+import mmap
 import os
+import re
 import sys
 import tempfile
 import webbrowser
 import shutil
 from typing import Dict, List, Optional, Union, Literal
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from itertools import islice
 from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Shared read-only default for missing nested objects, also used as a missing-key
+# sentinel in identity checks; never mutate it
+_EMPTY = {}
+
+# File extensions accepted by the Charles log tools
+_CHARLES_EXTS = ('.chls', '.chlsj')
+
+# Literals the stdlib json decodes but orjson rejects
+_NON_STANDARD_LITERALS = (b"NaN", b"Infinity", b"-Infinity")
+
+# A JSON number of 20+ digits, which may not fit in 64 bits; digits inside strings rarely follow :, [ or ,
+_BIG_INT = re.compile(rb'(?:^|[:,\[])\s*-?\d{20}')
+
+# Values accepted by the match_type argument of the filtering tools
+_VALID_MATCH_TYPES = frozenset(("exact", "contains"))
+
+# Detailed processing is only spread across threads when the interpreter runs without a GIL
+_FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+_PARALLEL_MIN_ENTRIES = 10000
+_executor = None
+
+# Shared output directory picked up by the standalone dashboard
+_SHARED_DIR = os.environ.get("MCP_CHARLES_SHARED_DIR", "/Users/pranjulraizada/NewAIProject/git/mcp-charles-shared/output")
+
 # Create an MCP server
 mcp = FastMCP("Charles-Proxy-Log-Parser")
 
+def _charles_tool(fn):
+    """Validate the Charles log file_path (and match_type, if any) of a tool and create its output_dir, then call it"""
+    signature = inspect.signature(fn)
+    has_match_type = "match_type" in signature.parameters
+    has_output_dir = "output_dir" in signature.parameters
+    
+    @wraps(fn)
+    def wrapper(file_path: str, *args, **kwargs):
+        # Validate file path
+        try:
+            os.stat(file_path)
+        except OSError:
+            return {"error": f"File not found: {file_path}"}
+        
+        if not file_path.endswith(_CHARLES_EXTS):
+            return {"error": "File must be a Charles log file (.chls or .chlsj)"}
+        
+        # Only the JSON export (.chlsj) can be parsed
+        if not file_path.endswith('.chlsj'):
+            return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+        
+        if has_match_type or has_output_dir:
+            bound = signature.bind(file_path, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            
+            # Validate match_type
+            if has_match_type and arguments["match_type"] not in _VALID_MATCH_TYPES:
+                return {"error": f"Invalid match_type: {arguments['match_type']}. Must be 'exact' or 'contains'"}
+            
+            # Validate output directory
+            if has_output_dir and not os.path.exists(arguments["output_dir"]):
+                try:
+                    os.makedirs(arguments["output_dir"])
+                except Exception as e:
+                    return {"error": f"Error creating output directory: {str(e)}"}
+        
+        return fn(file_path, *args, **kwargs)
+    return wrapper
+
 @mcp.tool()
+@_charles_tool
 def parse_charles_log(file_path: str, format_type: str = "summary") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) and convert it to a meaningful format.
@@ -25,24 +107,13 @@ def parse_charles_log(file_path: str, format_type: str = "summary") -> Dict:
     Returns:
         A dictionary containing the parsed log data
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            return _parse_chlsj_file(file_path, format_type)
-        except Exception as e:
-            return {"error": f"Error parsing .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        return _parse_chlsj_file(file_path, format_type)
+    except Exception as e:
+        return {"error": f"Error parsing .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_charles_log_by_path(file_path: str, path: str, format_type: str = "detailed", match_type: str = "exact") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) and extract only entries for a specific :path.
@@ -56,28 +127,13 @@ def parse_charles_log_by_path(file_path: str, path: str, format_type: str = "det
     Returns:
         A dictionary containing the parsed log data for the specified path
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate match_type
-    if match_type not in ["exact", "contains"]:
-        return {"error": f"Invalid match_type: {match_type}. Must be 'exact' or 'contains'"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            return _parse_chlsj_file_by_path(file_path, path, format_type, match_type)
-        except Exception as e:
-            return {"error": f"Error parsing .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        return _parse_chlsj_file_by(file_path, "path", path, format_type, match_type)
+    except Exception as e:
+        return {"error": f"Error parsing .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_charles_log_by_host(file_path: str, host: str, format_type: str = "detailed", match_type: str = "exact") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) and extract only entries for a specific host.
@@ -91,28 +147,13 @@ def parse_charles_log_by_host(file_path: str, host: str, format_type: str = "det
     Returns:
         A dictionary containing the parsed log data for the specified host
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate match_type
-    if match_type not in ["exact", "contains"]:
-        return {"error": f"Invalid match_type: {match_type}. Must be 'exact' or 'contains'"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            return _parse_chlsj_file_by_host(file_path, host, format_type, match_type)
-        except Exception as e:
-            return {"error": f"Error parsing .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        return _parse_chlsj_file_by(file_path, "host", host, format_type, match_type)
+    except Exception as e:
+        return {"error": f"Error parsing .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_and_save_charles_log(file_path: str, output_dir: str = "./output", format_type: str = "detailed") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) and save the result to the specified directory.
@@ -125,46 +166,27 @@ def parse_and_save_charles_log(file_path: str, output_dir: str = "./output", for
     Returns:
         A dictionary containing the result of the operation
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate output directory
-    if not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir)
-        except Exception as e:
-            return {"error": f"Error creating output directory: {str(e)}"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            result = _parse_chlsj_file(file_path, format_type)
-            
-            # Generate output filename
-            base_name = os.path.basename(file_path)
-            name_without_ext = os.path.splitext(base_name)[0]
-            output_file = os.path.join(output_dir, f"{name_without_ext}_parsed.json")
-            
-            # Write to file
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            return {
-                "status": "success",
-                "message": f"Successfully parsed and saved to {output_file}",
-                "output_file": output_file
-            }
-        except Exception as e:
-            return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        result = _parse_chlsj_file(file_path, format_type)
+        
+        # Generate output filename
+        base_name = os.path.basename(file_path)
+        name_without_ext = os.path.splitext(base_name)[0]
+        output_file = os.path.join(output_dir, f"{name_without_ext}_parsed.json")
+        
+        # Write to file
+        _dump(result, output_file)
+        
+        return {
+            "status": "success",
+            "message": f"Successfully parsed and saved to {output_file}",
+            "output_file": output_file
+        }
+    except Exception as e:
+        return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_and_save_charles_log_by_path(file_path: str, path: str, output_dir: str = "./output", format_type: str = "detailed", match_type: str = "exact") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) for a specific :path and save the result to the specified directory.
@@ -179,55 +201,32 @@ def parse_and_save_charles_log_by_path(file_path: str, path: str, output_dir: st
     Returns:
         A dictionary containing the result of the operation
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate match_type
-    if match_type not in ["exact", "contains"]:
-        return {"error": f"Invalid match_type: {match_type}. Must be 'exact' or 'contains'"}
-    
-    # Validate output directory
-    if not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir)
-        except Exception as e:
-            return {"error": f"Error creating output directory: {str(e)}"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            result = _parse_chlsj_file_by_path(file_path, path, format_type, match_type)
-            
-            # Generate output filename
-            base_name = os.path.basename(file_path)
-            name_without_ext = os.path.splitext(base_name)[0]
-            safe_path = path.replace("/", "_").replace("?", "_").replace("=", "_").replace("&", "_")
-            match_str = "exact" if match_type == "exact" else "contains"
-            output_file = os.path.join(output_dir, f"{name_without_ext}_{safe_path}_{match_str}_parsed.json")
-            
-            # Write to file
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            return {
-                "status": "success",
-                "message": f"Successfully parsed and saved to {output_file}",
-                "output_file": output_file,
-                "filtered_by_path": path,
-                "match_type": match_type,
-                "entry_count": len(result.get("entries", [])) if "entries" in result else 0
-            }
-        except Exception as e:
-            return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        result = _parse_chlsj_file_by(file_path, "path", path, format_type, match_type)
+        
+        # Generate output filename
+        base_name = os.path.basename(file_path)
+        name_without_ext = os.path.splitext(base_name)[0]
+        safe_path = path.replace("/", "_").replace("?", "_").replace("=", "_").replace("&", "_")
+        match_str = "exact" if match_type == "exact" else "contains"
+        output_file = os.path.join(output_dir, f"{name_without_ext}_{safe_path}_{match_str}_parsed.json")
+        
+        # Write to file
+        _dump(result, output_file)
+        
+        return {
+            "status": "success",
+            "message": f"Successfully parsed and saved to {output_file}",
+            "output_file": output_file,
+            "filtered_by_path": path,
+            "match_type": match_type,
+            "entry_count": len(result.get("entries", [])) if "entries" in result else 0
+        }
+    except Exception as e:
+        return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_and_save_charles_log_by_host(file_path: str, host: str, output_dir: str = "./output", format_type: str = "detailed", match_type: str = "exact") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) for a specific host and save the result to the specified directory.
@@ -242,55 +241,32 @@ def parse_and_save_charles_log_by_host(file_path: str, host: str, output_dir: st
     Returns:
         A dictionary containing the result of the operation
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate match_type
-    if match_type not in ["exact", "contains"]:
-        return {"error": f"Invalid match_type: {match_type}. Must be 'exact' or 'contains'"}
-    
-    # Validate output directory
-    if not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir)
-        except Exception as e:
-            return {"error": f"Error creating output directory: {str(e)}"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            result = _parse_chlsj_file_by_host(file_path, host, format_type, match_type)
-            
-            # Generate output filename
-            base_name = os.path.basename(file_path)
-            name_without_ext = os.path.splitext(base_name)[0]
-            safe_host = host.replace(".", "_").replace("/", "_").replace(":", "_")
-            match_str = "exact" if match_type == "exact" else "contains"
-            output_file = os.path.join(output_dir, f"{name_without_ext}_{safe_host}_{match_str}.json")
-            
-            # Write to file
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            return {
-                "status": "success",
-                "message": f"Successfully parsed and saved to {output_file}",
-                "output_file": output_file,
-                "filtered_by_host": host,
-                "match_type": match_type,
-                "entry_count": len(result.get("entries", [])) if "entries" in result else 0
-            }
-        except Exception as e:
-            return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    try:
+        result = _parse_chlsj_file_by(file_path, "host", host, format_type, match_type)
+        
+        # Generate output filename
+        base_name = os.path.basename(file_path)
+        name_without_ext = os.path.splitext(base_name)[0]
+        safe_host = host.replace(".", "_").replace("/", "_").replace(":", "_")
+        match_str = "exact" if match_type == "exact" else "contains"
+        output_file = os.path.join(output_dir, f"{name_without_ext}_{safe_host}_{match_str}.json")
+        
+        # Write to file
+        _dump(result, output_file)
+        
+        return {
+            "status": "success",
+            "message": f"Successfully parsed and saved to {output_file}",
+            "output_file": output_file,
+            "filtered_by_host": host,
+            "match_type": match_type,
+            "entry_count": len(result.get("entries", [])) if "entries" in result else 0
+        }
+    except Exception as e:
+        return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
 
 @mcp.tool()
+@_charles_tool
 def parse_and_save_charles_log_exclude_host(file_path: str, host: str, output_dir: str = "./output", format_type: str = "detailed", match_type: str = "exact") -> Dict:
     """
     Parse a Charles log file (.chls or .chlsj) and save entries that don't match the specified host.
@@ -305,81 +281,17 @@ def parse_and_save_charles_log_exclude_host(file_path: str, host: str, output_di
     Returns:
         A dictionary containing the result of the operation
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
-    # Validate match_type
-    if match_type not in ["exact", "contains"]:
-        return {"error": f"Invalid match_type: {match_type}. Must be 'exact' or 'contains'"}
-    
-    # Validate output directory
-    if not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir)
-        except Exception as e:
-            return {"error": f"Error creating output directory: {str(e)}"}
-    
-    # For .chlsj files (JSON format)
-    if file_path.endswith('.chlsj'):
-        try:
-            # First try to parse the file as a whole JSON array
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Try to parse the file as a JSON array
-                all_entries = json.loads(content)
-                # If entries is not a list, wrap it in one
-                if not isinstance(all_entries, list):
-                    all_entries = [all_entries]
-        except json.JSONDecodeError:
-            # If it fails, fall back to line-by-line parsing
-            all_entries = []
-            with open(file_path, 'r') as f:
-                # .chlsj files may contain one JSON object per line
-                for line in f:
-                    try:
-                        if line.strip():  # Skip empty lines
-                            entry = json.loads(line.strip())
-                            all_entries.append(entry)
-                    except json.JSONDecodeError:
-                        continue  # Skip invalid lines
-        
+    try:
         # Filter entries that don't match the host and exclude .js, .svg, .png files
-        filtered_entries = []
-        for entry in all_entries:
-            entry_host = entry.get("host", "")
-            entry_path = entry.get("path", "")
-            
-            # Skip if path is None or contains .js, .svg, or .png
-            if entry_path is None or any(ext in entry_path.lower() for ext in [".js", ".svg", ".png"]):
-                continue
-            
-            # Skip if host is None
-            if entry_host is None:
-                continue
-            
-            # Include entries that don't match the host
-            if match_type == "exact":
-                # Exact match (case-insensitive)
-                if entry_host.lower() != host.lower():
-                    filtered_entries.append(entry)
-            else:  # "contains"
-                # Substring match (case-insensitive)
-                if host.lower() not in entry_host.lower():
-                    filtered_entries.append(entry)
+        filtered_entries = list(_filter_entries(_iter_entries(file_path), "host", host, match_type, exclude=True))
         
         # Process entries based on format type
         result = None
         if format_type == "raw":
             result = {"entries": filtered_entries, "excluded_host": host, "match_type": match_type}
         elif format_type == "summary":
-            # Reuse the summary logic from _parse_chlsj_file_by_host
             result = _process_entries_summary(filtered_entries, host, match_type, is_exclude=True)
         else:
-            # Reuse the detailed logic from _parse_chlsj_file_by_host
             result = _process_entries_detailed(filtered_entries, host, match_type, is_exclude=True)
         
         # Generate output filename
@@ -390,8 +302,7 @@ def parse_and_save_charles_log_exclude_host(file_path: str, host: str, output_di
         output_file = os.path.join(output_dir, f"{name_without_ext}_exclude_{safe_host}_{match_str}_parsed.json")
         
         # Write to file
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        _dump(result, output_file)
         
         return {
             "status": "success",
@@ -401,147 +312,183 @@ def parse_and_save_charles_log_exclude_host(file_path: str, host: str, output_di
             "match_type": match_type,
             "entry_count": len(filtered_entries)
         }
-    
-    # For .chls files (binary format)
-    return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
+    except Exception as e:
+        return {"error": f"Error parsing or saving .chlsj file: {str(e)}"}
+
+def _content_type_from_dict(headers: Dict):
+    """Content-Type from headers stored as a name -> list of values dict"""
+    content_type_values = headers.get("Content-Type")
+    if content_type_values is None:
+        # Header names are case-insensitive, so fall back to scanning for any other spelling
+        for name, values in headers.items():
+            if isinstance(name, str) and name.casefold() == "content-type":
+                content_type_values = values
+                break
+    if isinstance(content_type_values, list):
+        return content_type_values[0] if content_type_values else None
+    if isinstance(content_type_values, str):
+        return content_type_values
+    return None
+
+def _content_type_from_list(headers: List):
+    """Content-Type from headers stored as a list of objects with name/value"""
+    for header in headers:
+        if isinstance(header, dict):
+            name = header.get("name")
+            if isinstance(name, str) and name.casefold() == "content-type":
+                return header.get("value")
+    return None
+
+# Content-Type readers by the exact type of the parsed headers value
+_CONTENT_TYPE_READERS = {dict: _content_type_from_dict, list: _content_type_from_list}
+
+def _content_type(response):
+    """Return the first Content-Type of a response, or "UNKNOWN" if it has none"""
+    response_headers = response.get("headers", _EMPTY)
+    reader = _CONTENT_TYPE_READERS.get(type(response_headers))
+    content_type = reader(response_headers) if reader is not None else None
+    return content_type if content_type is not None else "UNKNOWN"
+
+def _entry_duration(entry):
+    """Return the duration of an entry, or None if it has none"""
+    duration = entry.get("duration", _EMPTY)
+    if duration is not _EMPTY:
+        return duration
+    durations = entry.get("durations")
+    if isinstance(durations, dict):
+        # Some Charles formats store duration in "durations.total"
+        return durations.get("total")
+    return None
+
+def _timing_stats(durations: List, total_entries: int) -> Dict:
+    """Reduce collected durations to min/max/avg/total in single C-level passes"""
+    total = sum(durations)
+    return {
+        # If no durations were seen, report min as 0
+        "min": min(durations) if durations else 0,
+        "max": max(max(durations), 0) if durations else 0,
+        "avg": total / total_entries if total_entries > 0 else 0,
+        "total": total
+    }
 
 def _process_entries_summary(entries, host, match_type, is_exclude=False):
     """Helper function to generate summary format for entries"""
-    summary = {
+    # Pull each field out in one pass so the Counters and min/max/sum run over plain sequences
+    requests = [entry.get("request") or _EMPTY for entry in entries]
+    responses = [entry.get("response") or _EMPTY for entry in entries]
+    durations = [duration for duration in map(_entry_duration, entries) if duration is not None]
+    
+    return {
         "total_entries": len(entries),
         "excluded_host" if is_exclude else "filtered_by_host": host,
         "match_type": match_type,
-        "request_methods": {},
-        "status_codes": {},
-        "content_types": {},
-        "timing": {
-            "min": float('inf'),
-            "max": 0,
-            "avg": 0,
-            "total": 0
-        }
+        "request_methods": dict(Counter(request.get("method", "UNKNOWN") for request in requests)),
+        "status_codes": dict(Counter(str(response.get("status", 0)) for response in responses)),
+        "content_types": dict(Counter(map(_content_type, responses))),
+        "timing": _timing_stats(durations, len(entries))
+    }
+
+def _flatten_headers(headers) -> Dict:
+    """Turn a list of name/value header objects into a name -> value dict"""
+    if isinstance(headers, dict):
+        return headers
+    return {header["name"]: header["value"] for header in headers
+            if isinstance(header, dict) and "name" in header and "value" in header}
+
+def _process_entry(entry: Dict) -> Dict:
+    """Extract the fields of one entry for the detailed format"""
+    get = entry.get
+    request = get("request")
+    response = get("response")
+    
+    # Some Charles formats use top-level status; the response status wins when present
+    status = get("status", "")
+    if response is not None and "status" in response:
+        status = response["status"]
+    
+    # Handle different duration fields
+    duration = get("duration", _EMPTY)
+    if duration is _EMPTY:
+        # Some Charles formats store duration in "durations.total"
+        durations = get("durations")
+        duration = durations.get("total") if isinstance(durations, dict) else None
+        if duration is None:
+            duration = 0
+    
+    # Extract basic fields in one dict literal; request and response fields follow
+    processed_entry = {
+        "url": get("url", ""),
+        "host": get("host", ""),
+        "path": get("path", ""),
+        "status": status,
+        "duration": duration,
     }
     
-    for entry in entries:
-        # Count request methods
-        method = entry.get("request", {}).get("method", "UNKNOWN")
-        summary["request_methods"][method] = summary["request_methods"].get(method, 0) + 1
-        
-        # Count status codes
-        status = entry.get("response", {}).get("status", 0)
-        status_str = str(status)
-        summary["status_codes"][status_str] = summary["status_codes"].get(status_str, 0) + 1
-        
-        # Count content types
-        content_type = None
-        response_headers = entry.get("response", {}).get("headers", {})
-        if isinstance(response_headers, dict):
-            content_type_values = response_headers.get("Content-Type", ["UNKNOWN"])
-            if isinstance(content_type_values, list) and len(content_type_values) > 0:
-                content_type = content_type_values[0]
-        elif isinstance(response_headers, list):
-            # Some Charles formats store headers as a list of objects with name/value
-            for header in response_headers:
-                if isinstance(header, dict) and header.get("name") == "Content-Type":
-                    content_type = header.get("value")
-                    break
+    # Process request fields
+    if request is not None:
+        processed_entry["method"] = request.get("method", "")
+        processed_entry["request_size"] = request.get("size", 0)
         
-        if content_type is None:
-            content_type = "UNKNOWN"
-            
-        summary["content_types"][content_type] = summary["content_types"].get(content_type, 0) + 1
-        
-        # Calculate timing stats
-        if "duration" in entry:
-            duration = entry["duration"]
-            summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-            summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-            summary["timing"]["total"] += duration
-        elif "durations" in entry and isinstance(entry["durations"], dict):
-            # Some Charles formats store duration in "durations.total"
-            duration = entry["durations"].get("total")
-            if duration is not None:
-                summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                summary["timing"]["total"] += duration
-    
-    # Calculate average
-    if len(entries) > 0:
-        summary["timing"]["avg"] = summary["timing"]["total"] / len(entries)
-    
-    # If no entries, reset min to 0
-    if summary["timing"]["min"] == float('inf'):
-        summary["timing"]["min"] = 0
+        # Process request headers
+        header = request.get("header")
+        if header is not None and "headers" in header:
+            # Some Charles formats nest headers under header.headers
+            processed_entry["request_headers"] = _flatten_headers(header["headers"])
+        else:
+            headers = request.get("headers", _EMPTY)
+            if headers is not _EMPTY:
+                # Standard format
+                processed_entry["request_headers"] = headers
         
-    return summary
-
-def _process_entries_detailed(entries, host, match_type, is_exclude=False):
-    """Helper function to generate detailed format for entries"""
-    processed_entries = []
+        # Add request body if available
+        if "body" in request:
+            processed_entry["request_body"] = request["body"]
     
-    for entry in entries:
-        # Extract basic fields
-        processed_entry = {
-            "url": entry.get("url", ""),
-            "host": entry.get("host", ""),
-            "path": entry.get("path", ""),
-            "status": entry.get("status", ""),  # Some Charles formats use top-level status
-            "duration": 0,
-        }
+    # Process response fields
+    if response is not None:
+        processed_entry["response_size"] = response.get("size", 0)
         
-        # Process request fields
-        if "request" in entry:
-            request = entry["request"]
-            processed_entry["method"] = request.get("method", "")
-            processed_entry["request_size"] = request.get("size", 0)
-            
-            # Process request headers
-            if "header" in request and "headers" in request["header"]:
-                # Some Charles formats nest headers under header.headers
-                processed_entry["request_headers"] = {}
-                for header in request["header"]["headers"]:
-                    if isinstance(header, dict) and "name" in header and "value" in header:
-                        processed_entry["request_headers"][header["name"]] = header["value"]
-            elif "headers" in request:
-                # Standard format
-                processed_entry["request_headers"] = request["headers"]
-            
-            # Add request body if available
-            if "body" in request:
-                processed_entry["request_body"] = request["body"]
-        
-        # Process response fields
-        if "response" in entry:
-            response = entry["response"]
-            if "status" in response:
-                processed_entry["status"] = response["status"]
-            processed_entry["response_size"] = response.get("size", 0)
-            
-            # Process response headers
-            if "header" in response and "headers" in response["header"]:
-                # Some Charles formats nest headers under header.headers
-                processed_entry["response_headers"] = {}
-                for header in response["header"]["headers"]:
-                    if isinstance(header, dict) and "name" in header and "value" in header:
-                        processed_entry["response_headers"][header["name"]] = header["value"]
-            elif "headers" in response:
+        # Process response headers
+        header = response.get("header")
+        if header is not None and "headers" in header:
+            # Some Charles formats nest headers under header.headers
+            processed_entry["response_headers"] = _flatten_headers(header["headers"])
+        else:
+            headers = response.get("headers", _EMPTY)
+            if headers is not _EMPTY:
                 # Standard format
-                processed_entry["response_headers"] = response["headers"]
-            
-            # Add response body if available
-            if "body" in response:
-                processed_entry["response_body"] = response["body"]
-        
-        # Handle different duration fields
-        if "duration" in entry:
-            processed_entry["duration"] = entry["duration"]
-        elif "durations" in entry and isinstance(entry["durations"], dict):
-            # Some Charles formats store duration in "durations.total"
-            total_duration = entry["durations"].get("total")
-            if total_duration is not None:
-                processed_entry["duration"] = total_duration
+                processed_entry["response_headers"] = headers
         
-        processed_entries.append(processed_entry)
+        # Add response body if available
+        if "body" in response:
+            processed_entry["response_body"] = response["body"]
+    
+    return processed_entry
+
+def _process_chunk(entries: List) -> List[Dict]:
+    """Run _process_entry over a list of entries in the current thread"""
+    return [_process_entry(entry) for entry in entries]
+
+def _process_entries(entries) -> List[Dict]:
+    """Run _process_entry over entries, in parallel shards on free-threaded builds"""
+    global _executor
+    if not _FREE_THREADED:
+        return _process_chunk(entries)
+    
+    entries = list(entries)
+    if len(entries) < _PARALLEL_MIN_ENTRIES:
+        return _process_chunk(entries)
+    
+    # The pool is created once and shared by later calls
+    if _executor is None:
+        _executor = ThreadPoolExecutor()
+    shard_size = -(-len(entries) // (os.cpu_count() or 1))
+    shards = (entries[i:i + shard_size] for i in range(0, len(entries), shard_size))
+    return [entry for shard in _executor.map(_process_chunk, shards) for entry in shard]
+
+def _process_entries_detailed(entries, host, match_type, is_exclude=False):
+    """Helper function to generate detailed format for entries"""
+    processed_entries = _process_entries(entries)
     
     return {
         "entries": processed_entries,
@@ -550,7 +497,8 @@ def _process_entries_detailed(entries, host, match_type, is_exclude=False):
     }
 
 @mcp.tool()
-def read_large_file_part(file_path: str, start_offset: int = 0, length: int = 1000000) -> Dict:
+@_charles_tool
+def read_large_file_part(file_path: str, start_offset: int = 0, length: int = 1000000, include_bodies: bool = True) -> Dict:
     """
     Read part of a large Charles log file for incremental processing.
     
@@ -558,134 +506,235 @@ def read_large_file_part(file_path: str, start_offset: int = 0, length: int = 10
         file_path: Path to the Charles log file
         start_offset: Starting byte offset in the file
         length: Maximum number of bytes to read
+        include_bodies: Whether to keep request and response bodies in the returned entries
         
     Returns:
         A dictionary containing the file part data and metadata
     """
-    # Validate file path
-    if not os.path.exists(file_path):
-        return {"error": f"File not found: {file_path}"}
-    
-    if not file_path.endswith(('.chls', '.chlsj')):
-        return {"error": "File must be a Charles log file (.chls or .chlsj)"}
-    
     try:
-        # Get file size
-        file_size = os.path.getsize(file_path)
-        
-        # Validate offset
-        if start_offset < 0 or start_offset >= file_size:
-            return {"error": f"Invalid offset: {start_offset}. File size is {file_size} bytes."}
-        
-        # Adjust length if it goes beyond the end of file
-        if start_offset + length > file_size:
-            length = file_size - start_offset
-        
-        # If this is the first read (offset=0), check if the file is a JSON array or line-by-line
-        is_json_array = False
-        if start_offset == 0:
-            # Read a small portion to detect format
-            with open(file_path, 'r') as f:
-                sample = f.read(min(1000, file_size))
-                sample = sample.strip()
-                # Check if it starts with '[' which indicates a JSON array
-                if sample.startswith('['):
-                    is_json_array = True
-        
-        # Process content for .chlsj files
-        if file_path.endswith('.chlsj'):
-            entries = []
+        with open(file_path, 'rb') as f:
+            # Get file size from the open file
+            file_size = os.fstat(f.fileno()).st_size
+            
+            # Validate offset
+            if start_offset < 0 or start_offset >= file_size:
+                return {"error": f"Invalid offset: {start_offset}. File size is {file_size} bytes."}
             
-            if is_json_array:
-                # For JSON array format
-                if start_offset == 0:
-                    # Read the entire file if it's a JSON array and this is the first chunk
-                    with open(file_path, 'r') as f:
+            # Adjust length if it goes beyond the end of file
+            if start_offset + length > file_size:
+                length = file_size - start_offset
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # If this is the first read (offset=0), check if the file is a JSON array or line-by-line
+                # by peeking at its first non-whitespace byte
+                is_json_array = start_offset == 0 and mm[:1000].lstrip()[:1] == b'['
+                
+                entries = []
+                
+                if is_json_array:
+                    # For JSON array format
+                    if start_offset == 0:
+                        # Read the entire file if it's a JSON array and this is the first chunk
                         try:
-                            content = f.read()
-                            entries = json.loads(content)
+                            with memoryview(mm) as view:
+                                entries = _loads(view)
                             # Set flag to indicate we've read everything
                             next_offset = file_size
                         except json.JSONDecodeError as e:
                             return {"error": f"Error parsing JSON array: {str(e)}"}
+                    else:
+                        # For subsequent chunks, we don't re-read the array since we got it all on first pass
+                        entries = []
+                        next_offset = file_size
                 else:
-                    # For subsequent chunks, we don't re-read the array since we got it all on first pass
-                    entries = []
-                    next_offset = file_size
-            else:
-                # For line-by-line format
-                with open(file_path, 'r') as f:
-                    f.seek(start_offset)
-                    content = f.read(length)
+                    # For line-by-line format; a line that crosses the end of the chunk is read
+                    # to its end, so the next chunk starts on a line boundary
+                    end_offset = start_offset + length
+                    # The chunk is scanned front to back, so let the kernel read ahead (not on Windows)
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    mm.seek(start_offset)
+                    while mm.tell() < end_offset:
+                        line = mm.readline()
+                        if line.isspace():  # Skip empty lines
+                            continue
+                        try:
+                            entries.append(_loads(line))
+                        except json.JSONDecodeError:
+                            continue  # Skip invalid lines
+                    next_offset = mm.tell()
                 
-                lines = content.splitlines()
+                if not include_bodies:
+                    # Bodies are usually most of the bytes sent back to the client
+                    _drop_bodies(entries)
                 
-                for line in lines:
-                    try:
-                        if line.strip():  # Skip empty lines
-                            entry = json.loads(line.strip())
-                            entries.append(entry)
-                    except json.JSONDecodeError:
-                        continue  # Skip invalid lines
-                
-                # Calculate next offset
-                next_offset = start_offset + length
-            
-            return {
-                "entries": entries,
-                "metadata": {
-                    "file_size": file_size,
-                    "current_offset": start_offset,
-                    "read_bytes": length,
-                    "entry_count": len(entries),
-                    "has_more": next_offset < file_size,
-                    "next_offset": next_offset if next_offset < file_size else None,
-                    "format": "json_array" if is_json_array else "line_by_line"
+                return {
+                    "entries": entries,
+                    "metadata": {
+                        "file_size": file_size,
+                        "current_offset": start_offset,
+                        # Bytes actually consumed, which can exceed length when the last line crosses it
+                        "read_bytes": next_offset - start_offset,
+                        "entry_count": len(entries),
+                        "has_more": next_offset < file_size,
+                        "next_offset": next_offset if next_offset < file_size else None,
+                        "format": "json_array" if is_json_array else "line_by_line"
+                    }
                 }
-            }
-        
-        # For .chls files (binary format)
-        return {"error": "Binary .chls files are not supported yet, please export as .chlsj from Charles"}
         
     except Exception as e:
         return {"error": f"Error reading file: {str(e)}"}
 
-def _parse_chlsj_file(file_path: str, format_type: str) -> Dict:
+def _drop_bodies(entries) -> None:
+    """Remove request and response bodies from entries in place"""
+    for entry in entries:
+        if isinstance(entry, dict):
+            for part in (entry.get("request"), entry.get("response")):
+                if isinstance(part, dict):
+                    part.pop("body", None)
+
+def _is_non_standard(data, error) -> bool:
+    """Whether orjson rejected JSON the stdlib json accepts: NaN/Infinity literals or numbers too big for a double."""
+    if "infinity" in error.msg or "out of range" in error.msg:
+        return True
+    if error.msg not in ("unexpected character", "no digit after minus sign"):
+        return False
+    # orjson counts the position in characters, so map it to a byte offset through the decoded prefix
+    prefix = bytes(data[:4 * error.pos]).decode("utf-8", "ignore")[:error.pos]
+    start = len(prefix.encode())
+    return bytes(data[start:start + 9]).startswith(_NON_STANDARD_LITERALS)
+
+def _loads(data):
+    """Decode JSON with orjson, using the stdlib json for non-standard input (NaN, Infinity, integers over 64 bits)."""
+    # orjson silently turns integers over 64 bits into floats, so documents that may hold one skip it
+    if _json is not json and _BIG_INT.search(data) is None:
+        try:
+            return _json.loads(data)
+        except json.JSONDecodeError as e:
+            # Anything else is malformed for both parsers, so the caller's error or fallback path runs without a second parse
+            if not _is_non_standard(data, e):
+                raise
+    # The stdlib json only accepts str and bytes, not memoryviews
+    return json.loads(bytes(data))
+
+def _write_indented(f, obj) -> None:
     """
-    Parse a .chlsj file (Charles log in JSON format)
+    Write obj to a binary file as orjson-indented JSON.
     
-    Args:
-        file_path: Path to the .chlsj file
-        format_type: Type of output format (summary, detailed, or raw)
-        
-    Returns:
-        Dictionary with parsed data
+    Lists directly under a top-level dict, like "entries", are encoded one item at a
+    time, so the encoded copy of a large result is never held in memory as a whole.
     """
-    # First try to parse the file as a whole JSON array
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            # Try to parse the file as a JSON array
-            all_entries = json.loads(content)
-            # If entries is not a list, wrap it in one
-            if not isinstance(all_entries, list):
-                all_entries = [all_entries]
-    except json.JSONDecodeError:
-        # If it fails, fall back to line-by-line parsing
-        all_entries = []
-        with open(file_path, 'r') as f:
-            # .chlsj files may contain one JSON object per line
-            for line in f:
+    option = _json.OPT_INDENT_2 | _json.OPT_NON_STR_KEYS
+    if not isinstance(obj, dict) or not obj:
+        f.write(_json.dumps(obj, option=option))
+        return
+    
+    # JSON strings cannot hold raw newlines, so indenting nested output is a plain replace
+    for i, (key, value) in enumerate(obj.items()):
+        f.write(b",\n  " if i else b"{\n  ")
+        f.write(_json.dumps(key))
+        f.write(b": ")
+        if isinstance(value, list) and value:
+            for j, item in enumerate(value):
+                f.write(b",\n    " if j else b"[\n    ")
+                f.write(_json.dumps(item, option=option).replace(b"\n", b"\n    "))
+            f.write(b"\n  ]")
+        else:
+            f.write(_json.dumps(value, option=option).replace(b"\n", b"\n  "))
+    f.write(b"\n}")
+
+def _dump(obj, output_file: str) -> None:
+    """Write obj to output_file as indented JSON, using orjson when it can encode obj."""
+    if _json is not json:
+        try:
+            with open(output_file, 'wb') as f:
+                _write_indented(f, obj)
+            return
+        except TypeError:
+            # orjson rejects some values the stdlib accepts, such as integers over 64 bits;
+            # the stdlib rewrites the file from the start
+            pass
+    with open(output_file, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+def _load_entries(file_path: str) -> List:
+    """Load every entry of a .chlsj file, either a JSON array or one JSON object per line."""
+    all_entries = []
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file, which has no entries anyway
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # First try to parse the file as a whole JSON array
                 try:
-                    if line.strip():  # Skip empty lines
-                        entry = json.loads(line.strip())
-                        all_entries.append(entry)
+                    with memoryview(mm) as view:
+                        all_entries = _loads(view)
+                    # If entries is not a list, wrap it in one
+                    if not isinstance(all_entries, list):
+                        all_entries = [all_entries]
                 except json.JSONDecodeError:
-                    continue  # Skip invalid lines
+                    # If it fails, fall back to line-by-line parsing
+                    # .chlsj files may contain one JSON object per line
+                    for line in iter(mm.readline, b""):
+                        if line.isspace():  # Skip empty lines
+                            continue
+                        try:
+                            all_entries.append(_loads(line))
+                        except json.JSONDecodeError:
+                            continue  # Skip invalid lines
+    return all_entries
+
+def _iter_entries(file_path: str):
+    """
+    Yield the entries of a .chlsj file one at a time.
+    
+    JSON arrays are streamed with ijson when it is installed and files with
+    one JSON object per line are parsed line by line, so only the current
+    entry is held in memory; other files go through _load_entries.
     
-    # Remove duplicates based on :path while keeping the first occurrence
+    ijson rejects NaN/Infinity and integers over 64 bits and stops at a truncated
+    array, all of which _load_entries handles, so on an ijson error the file is
+    read again through _load_entries, skipping the entries already yielded.
+    """
+    yielded = 0
+    with open(file_path, 'rb') as f:
+        first_char = f.read(64).lstrip()[:1]
+        f.seek(0)
+        if first_char == b'[' and ijson is not None:
+            items = ijson.items(f, 'item', use_float=True)
+            while True:
+                try:
+                    entry = next(items)
+                except StopIteration:
+                    return
+                except ijson.JSONError:
+                    break
+                yield entry
+                yielded += 1
+        if first_char == b'{':
+            for line in f:
+                if not line.isspace():
+                    break
+            try:
+                first_entry = _loads(line)
+            except json.JSONDecodeError:
+                # A pretty-printed single object spans several lines
+                first_entry = None
+            if first_entry is not None:
+                yield first_entry
+                for line in f:
+                    if line.isspace():  # Skip empty lines
+                        continue
+                    try:
+                        entry = _loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Skip invalid lines
+                    yield entry
+                return
+    yield from islice(_load_entries(file_path), yielded, None)
+
+def _unique_entries(all_entries):
+    """Yield entries with a new :path, skipping static assets (.js, .svg, .png)."""
     seen_paths = {}
-    unique_entries = []
     for entry in all_entries:
         path = entry.get(":path")
         if not path:  # If :path is not available, construct it from path and query parameters
@@ -699,564 +748,207 @@ def _parse_chlsj_file(file_path: str, format_type: str) -> Dict:
         
         if path not in seen_paths:
             seen_paths[path] = True
-            unique_entries.append(entry)
+            path = entry.get("path", "")
+            # Skip if path is None or contains .js, .svg, or .png
+            if path is not None and not any(ext in path.lower() for ext in [".js", ".svg", ".png"]):
+                yield entry
+
+def _cached_parse(fn):
+    """
+    Memoize the summary results of a parse helper on its arguments plus the file's mtime and size.
     
-    # Filter out entries with .js, .svg, or .png in the path
-    entries = []
-    for entry in unique_entries:
-        path = entry.get("path", "")
-        # Skip if path is None or contains .js, .svg, or .png
-        if path is not None and not any(ext in path.lower() for ext in [".js", ".svg", ".png"]):
-            entries.append(entry)
+    Only summaries are cached: they are small, while detailed and raw results hold every
+    entry (bodies included) and must be freed once the caller has used them.
+    """
+    # Position of format_type among the arguments after file_path
+    format_index = list(inspect.signature(fn).parameters).index("format_type") - 1
+    
+    @lru_cache(maxsize=8)
+    def cached(file_path, mtime_ns, size, *args):
+        return fn(file_path, *args)
+    
+    @wraps(fn)
+    def wrapper(file_path: str, *args):
+        if args[format_index] != "summary":
+            return fn(file_path, *args)
+        # A changed file gets a new key, so stale results are never returned
+        st = os.stat(file_path)
+        # Each caller gets its own copy, so changing a result cannot alter the cached one
+        return copy.deepcopy(cached(file_path, st.st_mtime_ns, st.st_size, *args))
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+@_cached_parse
+def _parse_chlsj_file(file_path: str, format_type: str) -> Dict:
+    """
+    Parse a .chlsj file (Charles log in JSON format)
+    
+    Args:
+        file_path: Path to the .chlsj file
+        format_type: Type of output format (summary, detailed, or raw)
+        
+    Returns:
+        Dictionary with parsed data
+    """
+    # Remove duplicates based on :path while keeping the first occurrence,
+    # then filter out entries with .js, .svg, or .png in the path
+    entries = _unique_entries(_iter_entries(file_path))
     
     # Process based on format type
     if format_type == "raw":
-        return {"entries": entries}
+        # Raw output holds every entry in memory
+        return {"entries": list(entries)}
     
     elif format_type == "summary":
-        summary = {
-            "total_entries": len(entries),
-            "request_methods": {},
-            "status_codes": {},
-            "hosts": {},
-            "content_types": {},
-            "timing": {
-                "min": float('inf'),
-                "max": 0,
-                "avg": 0,
-                "total": 0
-            }
-        }
+        total_entries = 0
+        methods = Counter()
+        status_codes = Counter()
+        hosts = Counter()
+        content_types = Counter()
+        durations = []
         
         for entry in entries:
+            total_entries += 1
+            request = entry.get("request") or _EMPTY
+            response = entry.get("response") or _EMPTY
+            
             # Count request methods
-            method = entry.get("request", {}).get("method", "UNKNOWN")
-            summary["request_methods"][method] = summary["request_methods"].get(method, 0) + 1
+            methods[request.get("method", "UNKNOWN")] += 1
             
             # Count status codes
-            status = entry.get("response", {}).get("status", 0)
-            status_str = str(status)
-            summary["status_codes"][status_str] = summary["status_codes"].get(status_str, 0) + 1
+            status_codes[str(response.get("status", 0))] += 1
             
             # Count hosts
-            host = entry.get("host", "UNKNOWN")
-            summary["hosts"][host] = summary["hosts"].get(host, 0) + 1
+            hosts[entry.get("host", "UNKNOWN")] += 1
             
             # Count content types
-            content_type = None
-            response_headers = entry.get("response", {}).get("headers", {})
-            if isinstance(response_headers, dict):
-                content_type_values = response_headers.get("Content-Type", ["UNKNOWN"])
-                if isinstance(content_type_values, list) and len(content_type_values) > 0:
-                    content_type = content_type_values[0]
-            elif isinstance(response_headers, list):
-                # Some Charles formats store headers as a list of objects with name/value
-                for header in response_headers:
-                    if isinstance(header, dict) and header.get("name") == "Content-Type":
-                        content_type = header.get("value")
-                        break
+            content_types[_content_type(response)] += 1
             
-            if content_type is None:
-                content_type = "UNKNOWN"
-                
-            summary["content_types"][content_type] = summary["content_types"].get(content_type, 0) + 1
-            
-            # Calculate timing stats
-            if "duration" in entry:
-                duration = entry["duration"]
-                summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                summary["timing"]["total"] += duration
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                duration = entry["durations"].get("total")
-                if duration is not None:
-                    summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                    summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                    summary["timing"]["total"] += duration
-        
-        # Calculate average
-        if len(entries) > 0:
-            summary["timing"]["avg"] = summary["timing"]["total"] / len(entries)
-        
-        # If no entries, reset min to 0
-        if summary["timing"]["min"] == float('inf'):
-            summary["timing"]["min"] = 0
-            
-        return summary
+            # Collect durations; min/max/sum are reduced once after the loop
+            duration = _entry_duration(entry)
+            if duration is not None:
+                durations.append(duration)
+        
+        return {
+            "total_entries": total_entries,
+            "request_methods": dict(methods),
+            "status_codes": dict(status_codes),
+            "hosts": dict(hosts),
+            "content_types": dict(content_types),
+            "timing": _timing_stats(durations, total_entries)
+        }
     
     # Detailed format (default)
     else:
-        processed_entries = []
-        
-        for entry in entries:
-            # Extract basic fields
-            processed_entry = {
-                "url": entry.get("url", ""),
-                "host": entry.get("host", ""),
-                "path": entry.get("path", ""),
-                "status": entry.get("status", ""),  # Some Charles formats use top-level status
-                "duration": 0,
-            }
-            
-            # Process request fields
-            if "request" in entry:
-                request = entry["request"]
-                processed_entry["method"] = request.get("method", "")
-                processed_entry["request_size"] = request.get("size", 0)
-                
-                # Process request headers
-                if "header" in request and "headers" in request["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["request_headers"] = {}
-                    for header in request["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["request_headers"][header["name"]] = header["value"]
-                elif "headers" in request:
-                    # Standard format
-                    processed_entry["request_headers"] = request["headers"]
-                
-                # Add request body if available
-                if "body" in request:
-                    processed_entry["request_body"] = request["body"]
-            
-            # Process response fields
-            if "response" in entry:
-                response = entry["response"]
-                if "status" in response:
-                    processed_entry["status"] = response["status"]
-                processed_entry["response_size"] = response.get("size", 0)
-                
-                # Process response headers
-                if "header" in response and "headers" in response["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["response_headers"] = {}
-                    for header in response["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["response_headers"][header["name"]] = header["value"]
-                elif "headers" in response:
-                    # Standard format
-                    processed_entry["response_headers"] = response["headers"]
-                
-                # Add response body if available
-                if "body" in response:
-                    processed_entry["response_body"] = response["body"]
-            
-            # Handle different duration fields
-            if "duration" in entry:
-                processed_entry["duration"] = entry["duration"]
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                total_duration = entry["durations"].get("total")
-                if total_duration is not None:
-                    processed_entry["duration"] = total_duration
-            
-            processed_entries.append(processed_entry)
+        processed_entries = _process_entries(entries)
         
         return {"entries": processed_entries}
 
-def _parse_chlsj_file_by_path(file_path: str, path: str, format_type: str, match_type: str = "exact") -> Dict:
-    """
-    Parse a .chlsj file (Charles log in JSON format) and filter by path
-    
-    Args:
-        file_path: Path to the .chlsj file
-        path: Path to filter by
-        format_type: Type of output format (summary, detailed, or raw)
-        match_type: Type of path matching to use ("exact" or "contains")
-        
-    Returns:
-        Dictionary with parsed data for the specified path
-    """
-    # First try to parse the file as a whole JSON array
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            # Try to parse the file as a JSON array
-            all_entries = json.loads(content)
-            # If entries is not a list, wrap it in one
-            if not isinstance(all_entries, list):
-                all_entries = [all_entries]
-    except json.JSONDecodeError:
-        # If it fails, fall back to line-by-line parsing
-        all_entries = []
-        with open(file_path, 'r') as f:
-            # .chlsj files may contain one JSON object per line
-            for line in f:
-                try:
-                    if line.strip():  # Skip empty lines
-                        entry = json.loads(line.strip())
-                        all_entries.append(entry)
-                except json.JSONDecodeError:
-                    continue  # Skip invalid lines
+def _filter_entries(entries, field: str, value: str, match_type: str, exclude: bool = False):
+    """Yield the entries whose field matches value (or doesn't, with exclude), skipping static assets (.js, .svg, .png)"""
+    # Matching is case-insensitive; the value is lowercased and the match type decided once
+    needle = value.lower()
+    exact = match_type == "exact"
     
-    # Filter entries by path based on match_type and exclude .js, .svg, .png files
-    filtered_entries = []
-    for entry in all_entries:
+    for entry in entries:
+        entry_value = entry.get(field, "")
         entry_path = entry.get("path", "")
         
         # Skip if path is None or contains .js, .svg, or .png
         if entry_path is None or any(ext in entry_path.lower() for ext in [".js", ".svg", ".png"]):
             continue
         
-        # Apply filtering based on match type
-        if match_type == "exact":
-            # Exact match (case-insensitive)
-            if entry_path.lower() == path.lower():
-                filtered_entries.append(entry)
-        else:  # "contains"
-            # Substring match (case-insensitive)
-            if path.lower() in entry_path.lower():
-                filtered_entries.append(entry)
-    
-    # Process based on format type
-    if format_type == "raw":
-        return {"entries": filtered_entries, "filtered_by_path": path, "match_type": match_type}
-    
-    elif format_type == "summary":
-        summary = {
-            "total_entries": len(filtered_entries),
-            "filtered_by_path": path,
-            "request_methods": {},
-            "status_codes": {},
-            "content_types": {},
-            "timing": {
-                "min": float('inf'),
-                "max": 0,
-                "avg": 0,
-                "total": 0
-            }
-        }
+        # Skip if the filtered field is None
+        if entry_value is None:
+            continue
         
-        for entry in filtered_entries:
-            # Count request methods
-            method = entry.get("request", {}).get("method", "UNKNOWN")
-            summary["request_methods"][method] = summary["request_methods"].get(method, 0) + 1
-            
-            # Count status codes
-            status = entry.get("response", {}).get("status", 0)
-            status_str = str(status)
-            summary["status_codes"][status_str] = summary["status_codes"].get(status_str, 0) + 1
-            
-            # Count content types
-            content_type = None
-            response_headers = entry.get("response", {}).get("headers", {})
-            if isinstance(response_headers, dict):
-                content_type_values = response_headers.get("Content-Type", ["UNKNOWN"])
-                if isinstance(content_type_values, list) and len(content_type_values) > 0:
-                    content_type = content_type_values[0]
-            elif isinstance(response_headers, list):
-                # Some Charles formats store headers as a list of objects with name/value
-                for header in response_headers:
-                    if isinstance(header, dict) and header.get("name") == "Content-Type":
-                        content_type = header.get("value")
-                        break
-            
-            if content_type is None:
-                content_type = "UNKNOWN"
-                
-            summary["content_types"][content_type] = summary["content_types"].get(content_type, 0) + 1
-            
-            # Calculate timing stats
-            if "duration" in entry:
-                duration = entry["duration"]
-                summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                summary["timing"]["total"] += duration
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                duration = entry["durations"].get("total")
-                if duration is not None:
-                    summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                    summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                    summary["timing"]["total"] += duration
-        
-        # Calculate average
-        if len(filtered_entries) > 0:
-            summary["timing"]["avg"] = summary["timing"]["total"] / len(filtered_entries)
-        
-        # If no entries, reset min to 0
-        if summary["timing"]["min"] == float('inf'):
-            summary["timing"]["min"] = 0
-            
-        return summary
-    
-    # Detailed format (default)
-    else:
-        processed_entries = []
+        # Exact or substring match, depending on match_type
+        entry_value = entry_value.lower()
+        matched = entry_value == needle if exact else needle in entry_value
         
-        for entry in filtered_entries:
-            # Extract basic fields
-            processed_entry = {
-                "url": entry.get("url", ""),
-                "host": entry.get("host", ""),
-                "path": entry.get("path", ""),
-                "status": entry.get("status", ""),  # Some Charles formats use top-level status
-                "duration": 0,
-            }
-            
-            # Process request fields
-            if "request" in entry:
-                request = entry["request"]
-                processed_entry["method"] = request.get("method", "")
-                processed_entry["request_size"] = request.get("size", 0)
-                
-                # Process request headers
-                if "header" in request and "headers" in request["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["request_headers"] = {}
-                    for header in request["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["request_headers"][header["name"]] = header["value"]
-                elif "headers" in request:
-                    # Standard format
-                    processed_entry["request_headers"] = request["headers"]
-                
-                # Add request body if available
-                if "body" in request:
-                    processed_entry["request_body"] = request["body"]
-            
-            # Process response fields
-            if "response" in entry:
-                response = entry["response"]
-                if "status" in response:
-                    processed_entry["status"] = response["status"]
-                processed_entry["response_size"] = response.get("size", 0)
-                
-                # Process response headers
-                if "header" in response and "headers" in response["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["response_headers"] = {}
-                    for header in response["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["response_headers"][header["name"]] = header["value"]
-                elif "headers" in response:
-                    # Standard format
-                    processed_entry["response_headers"] = response["headers"]
-                
-                # Add response body if available
-                if "body" in response:
-                    processed_entry["response_body"] = response["body"]
-            
-            # Handle different duration fields
-            if "duration" in entry:
-                processed_entry["duration"] = entry["duration"]
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                total_duration = entry["durations"].get("total")
-                if total_duration is not None:
-                    processed_entry["duration"] = total_duration
-            
-            processed_entries.append(processed_entry)
-        
-        return {"entries": processed_entries, "filtered_by_path": path, "match_type": match_type}
+        if matched != exclude:
+            yield entry
 
-def _parse_chlsj_file_by_host(file_path: str, host: str, format_type: str, match_type: str = "exact") -> Dict:
+@_cached_parse
+def _parse_chlsj_file_by(file_path: str, field: str, value: str, format_type: str, match_type: str = "exact") -> Dict:
     """
-    Parse a .chlsj file (Charles log in JSON format) and filter by host
+    Parse a .chlsj file (Charles log in JSON format) and filter by an entry field
     
     Args:
         file_path: Path to the .chlsj file
-        host: Host to filter by
+        field: Entry field to filter on ("path" or "host")
+        value: Value of the field to filter by
         format_type: Type of output format (summary, detailed, or raw)
-        match_type: Type of host matching to use ("exact" or "contains")
+        match_type: Type of matching to use ("exact" or "contains")
         
     Returns:
-        Dictionary with parsed data for the specified host
+        Dictionary with parsed data for the specified field value
     """
-    # First try to parse the file as a whole JSON array
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            # Try to parse the file as a JSON array
-            all_entries = json.loads(content)
-            # If entries is not a list, wrap it in one
-            if not isinstance(all_entries, list):
-                all_entries = [all_entries]
-    except json.JSONDecodeError:
-        # If it fails, fall back to line-by-line parsing
-        all_entries = []
-        with open(file_path, 'r') as f:
-            # .chlsj files may contain one JSON object per line
-            for line in f:
-                try:
-                    if line.strip():  # Skip empty lines
-                        entry = json.loads(line.strip())
-                        all_entries.append(entry)
-                except json.JSONDecodeError:
-                    continue  # Skip invalid lines
+    filter_key = f"filtered_by_{field}"
     
-    # Filter entries by host based on match_type and exclude .js, .svg, .png files
-    filtered_entries = []
-    for entry in all_entries:
-        entry_host = entry.get("host", "")
-        entry_path = entry.get("path", "")
-        
-        # Skip if path is None or contains .js, .svg, or .png
-        if entry_path is None or any(ext in entry_path.lower() for ext in [".js", ".svg", ".png"]):
-            continue
-        
-        # Skip if host is None
-        if entry_host is None:
-            continue
-        
-        # Apply filtering based on match type
-        if match_type == "exact":
-            # Exact match (case-insensitive)
-            if entry_host.lower() == host.lower():
-                filtered_entries.append(entry)
-        else:  # "contains"
-            # Substring match (case-insensitive)
-            if host.lower() in entry_host.lower():
-                filtered_entries.append(entry)
+    # Filter entries by field based on match_type and exclude .js, .svg, .png files;
+    # the summary consumes them as they are parsed, without building a list
+    filtered_entries = _filter_entries(_iter_entries(file_path), field, value, match_type)
     
     # Process based on format type
     if format_type == "raw":
-        return {"entries": filtered_entries, "filtered_by_host": host, "match_type": match_type}
+        return {"entries": list(filtered_entries), filter_key: value, "match_type": match_type}
     
     elif format_type == "summary":
-        summary = {
-            "total_entries": len(filtered_entries),
-            "filtered_by_host": host,
-            "request_methods": {},
-            "status_codes": {},
-            "content_types": {},
-            "timing": {
-                "min": float('inf'),
-                "max": 0,
-                "avg": 0,
-                "total": 0
-            }
-        }
+        total_entries = 0
+        methods = Counter()
+        status_codes = Counter()
+        content_types = Counter()
+        durations = []
         
         for entry in filtered_entries:
+            total_entries += 1
+            response = entry.get("response") or _EMPTY
+            
             # Count request methods
-            method = entry.get("request", {}).get("method", "UNKNOWN")
-            summary["request_methods"][method] = summary["request_methods"].get(method, 0) + 1
+            methods[(entry.get("request") or _EMPTY).get("method", "UNKNOWN")] += 1
             
             # Count status codes
-            status = entry.get("response", {}).get("status", 0)
-            status_str = str(status)
-            summary["status_codes"][status_str] = summary["status_codes"].get(status_str, 0) + 1
+            status_codes[str(response.get("status", 0))] += 1
             
             # Count content types
-            content_type = None
-            response_headers = entry.get("response", {}).get("headers", {})
-            if isinstance(response_headers, dict):
-                content_type_values = response_headers.get("Content-Type", ["UNKNOWN"])
-                if isinstance(content_type_values, list) and len(content_type_values) > 0:
-                    content_type = content_type_values[0]
-            elif isinstance(response_headers, list):
-                # Some Charles formats store headers as a list of objects with name/value
-                for header in response_headers:
-                    if isinstance(header, dict) and header.get("name") == "Content-Type":
-                        content_type = header.get("value")
-                        break
-            
-            if content_type is None:
-                content_type = "UNKNOWN"
-                
-            summary["content_types"][content_type] = summary["content_types"].get(content_type, 0) + 1
+            content_types[_content_type(response)] += 1
             
-            # Calculate timing stats
-            if "duration" in entry:
-                duration = entry["duration"]
-                summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                summary["timing"]["total"] += duration
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                duration = entry["durations"].get("total")
-                if duration is not None:
-                    summary["timing"]["min"] = min(summary["timing"]["min"], duration)
-                    summary["timing"]["max"] = max(summary["timing"]["max"], duration)
-                    summary["timing"]["total"] += duration
-        
-        # Calculate average
-        if len(filtered_entries) > 0:
-            summary["timing"]["avg"] = summary["timing"]["total"] / len(filtered_entries)
-        
-        # If no entries, reset min to 0
-        if summary["timing"]["min"] == float('inf'):
-            summary["timing"]["min"] = 0
-            
-        return summary
+            # Collect durations; min/max/sum are reduced once after the loop
+            duration = _entry_duration(entry)
+            if duration is not None:
+                durations.append(duration)
+        
+        return {
+            "total_entries": total_entries,
+            filter_key: value,
+            "request_methods": dict(methods),
+            "status_codes": dict(status_codes),
+            "content_types": dict(content_types),
+            "timing": _timing_stats(durations, total_entries)
+        }
     
     # Detailed format (default)
     else:
-        processed_entries = []
+        processed_entries = _process_entries(filtered_entries)
         
-        for entry in filtered_entries:
-            # Extract basic fields
-            processed_entry = {
-                "url": entry.get("url", ""),
-                "host": entry.get("host", ""),
-                "path": entry.get("path", ""),
-                "status": entry.get("status", ""),  # Some Charles formats use top-level status
-                "duration": 0,
-            }
-            
-            # Process request fields
-            if "request" in entry:
-                request = entry["request"]
-                processed_entry["method"] = request.get("method", "")
-                processed_entry["request_size"] = request.get("size", 0)
-                
-                # Process request headers
-                if "header" in request and "headers" in request["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["request_headers"] = {}
-                    for header in request["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["request_headers"][header["name"]] = header["value"]
-                elif "headers" in request:
-                    # Standard format
-                    processed_entry["request_headers"] = request["headers"]
-                
-                # Add request body if available
-                if "body" in request:
-                    processed_entry["request_body"] = request["body"]
-            
-            # Process response fields
-            if "response" in entry:
-                response = entry["response"]
-                if "status" in response:
-                    processed_entry["status"] = response["status"]
-                processed_entry["response_size"] = response.get("size", 0)
-                
-                # Process response headers
-                if "header" in response and "headers" in response["header"]:
-                    # Some Charles formats nest headers under header.headers
-                    processed_entry["response_headers"] = {}
-                    for header in response["header"]["headers"]:
-                        if isinstance(header, dict) and "name" in header and "value" in header:
-                            processed_entry["response_headers"][header["name"]] = header["value"]
-                elif "headers" in response:
-                    # Standard format
-                    processed_entry["response_headers"] = response["headers"]
-                
-                # Add response body if available
-                if "body" in response:
-                    processed_entry["response_body"] = response["body"]
-            
-            # Handle different duration fields
-            if "duration" in entry:
-                processed_entry["duration"] = entry["duration"]
-            elif "durations" in entry and isinstance(entry["durations"], dict):
-                # Some Charles formats store duration in "durations.total"
-                total_duration = entry["durations"].get("total")
-                if total_duration is not None:
-                    processed_entry["duration"] = total_duration
-            
-            processed_entries.append(processed_entry)
-        
-        return {"entries": processed_entries, "filtered_by_host": host, "match_type": match_type}
+        return {"entries": processed_entries, filter_key: value, "match_type": match_type}
+
+def _ensure_shared_dir() -> str:
+    """Create the shared dashboard directory if it is missing and return it"""
+    # Checked on every call, so a directory removed while the server runs is recreated
+    os.makedirs(_SHARED_DIR, exist_ok=True)
+    return _SHARED_DIR
 
 @mcp.tool()
 def view_charles_log_dashboard(file_path: str) -> Dict:
     """
     Opens a dashboard in the browser to visualize a parsed Charles log file.
     
+    The file is not parsed here: only its first and last bytes are checked to hold a
+    JSON object or array before it is copied as-is. Malformed JSON inside the document
+    is only reported by the dashboard when it loads the data.
+    
     Args:
         file_path: Path to the parsed JSON file
         
@@ -1271,17 +963,17 @@ def view_charles_log_dashboard(file_path: str) -> Dict:
         return {"error": "File must be a JSON file"}
     
     try:
-        # Load the parsed data
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        # Create shared directory if it doesn't exist
-        shared_dir = "/Users/pranjulraizada/NewAIProject/git/mcp-charles-shared/output"
-        if not os.path.exists(shared_dir):
-            os.makedirs(shared_dir)
+        # Check the file holds a JSON object or array by its first and last bytes;
+        # the dashboard does the actual parsing, so decoding it here is wasted work
+        with open(file_path, 'rb') as f:
+            first_char = f.read(256).lstrip()[:1]
+            f.seek(max(os.fstat(f.fileno()).st_size - 256, 0))
+            last_char = f.read().rstrip()[-1:]
+        if (first_char, last_char) not in ((b'{', b'}'), (b'[', b']')):
+            return {"error": f"Error preparing dashboard: {file_path} is not a JSON object or array"}
         
         # Copy the file to the shared directory
-        output_file = os.path.join(shared_dir, os.path.basename(file_path))
+        output_file = os.path.join(_ensure_shared_dir(), os.path.basename(file_path))
         shutil.copyfile(file_path, output_file)
         
         return {
@@ -1362,8 +1054,7 @@ def compare_api_structures(file_paths: List[str], output_dir: str = "./output",
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = os.path.join(output_dir, f"api_comparison_{timestamp}.json")
         
-        with open(output_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        _dump(summary, output_file)
         
         return {
             "status": "success",
@@ -1905,5 +1596,4 @@ def _deep_compare_structures(obj1, obj2, path, include_values=False):
 
 # Run the server if executed directly
 if __name__ == "__main__":
-    import sys
     mcp.run(transport='stdio') 
\ No newline at end of file
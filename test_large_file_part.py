@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+from server import read_large_file_part
+
+def _write_lines(entries):
+    """Write entries to a temporary .chlsj file, one JSON object per line."""
+    fd, file_path = tempfile.mkstemp(suffix=".chlsj")
+    with os.fdopen(fd, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return file_path
+
+def _read_in_chunks(file_path, length):
+    """Read a file through read_large_file_part, following next_offset until it is done."""
+    entries = []
+    chunks = []
+    offset = 0
+    while offset is not None:
+        result = read_large_file_part(file_path, offset, length)
+        entries.extend(result["entries"])
+        chunks.append(result["metadata"])
+        offset = result["metadata"]["next_offset"]
+    return entries, chunks
+
+def test_chunk_split_mid_line():
+    entries = [{"path": f"/api/{i}", "host": "example.com", "status": 200} for i in range(2)]
+    file_path = _write_lines(entries)
+    try:
+        # End the first chunk in the middle of the first line
+        first_line_length = len(json.dumps(entries[0])) + 1
+        read_entries, chunks = _read_in_chunks(file_path, first_line_length // 2)
+        
+        # Each entry appears exactly once
+        assert read_entries == entries
+        
+        # The first chunk reads its last line to the end, and says so
+        assert chunks[0]["read_bytes"] == first_line_length
+        assert chunks[0]["next_offset"] == first_line_length
+        assert sum(chunk["read_bytes"] for chunk in chunks) == os.path.getsize(file_path)
+    finally:
+        os.remove(file_path)
+
+def test_chunk_split_on_every_byte():
+    entries = [{"path": f"/api/{i}", "body": "x" * i} for i in range(5)]
+    file_path = _write_lines(entries)
+    try:
+        for length in range(1, os.path.getsize(file_path) + 1):
+            read_entries, _ = _read_in_chunks(file_path, length)
+            assert read_entries == entries, f"chunk length {length}"
+    finally:
+        os.remove(file_path)
+
+if __name__ == "__main__":
+    test_chunk_split_mid_line()
+    test_chunk_split_on_every_byte()
+    print("All read_large_file_part tests passed")
@@ -0,0 +1,83 @@
+import json
+import math
+import os
+import tempfile
+import server
+from server import _content_type, _iter_entries, parse_charles_log, parse_and_save_charles_log, read_large_file_part
+
+def _write(content):
+    """Write raw bytes to a temporary .chlsj file."""
+    fd, file_path = tempfile.mkstemp(suffix=".chlsj")
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    return file_path
+
+def _entries_and_summary(content):
+    """Return the streamed entries of a file plus the summary tool's result for it."""
+    file_path = _write(content)
+    try:
+        return list(_iter_entries(file_path)), parse_charles_log(file_path, "summary")
+    finally:
+        os.remove(file_path)
+
+def test_array_with_nan():
+    entries, summary = _entries_and_summary(b'[{"path": "/a", "duration": NaN}, {"path": "/b", "duration": Infinity}]')
+    
+    assert [entry["path"] for entry in entries] == ["/a", "/b"]
+    assert math.isnan(entries[0]["duration"])
+    assert entries[1]["duration"] == math.inf
+    assert "error" not in summary
+
+def test_array_with_big_int():
+    entries, summary = _entries_and_summary(b'[{"path": "/a", "id": 1}, {"path": "/b", "id": 123456789012345678901234567890}]')
+    
+    # The first entry is streamed before ijson overflows; the second comes from the fallback
+    assert [entry["path"] for entry in entries] == ["/a", "/b"]
+    assert "error" not in summary
+    assert summary["total_entries"] == 2
+
+def test_big_int_round_trip():
+    big_id = 123456789012345678901234567890
+    for content in (
+        b'[{"path": "/a", "id": 1}, {"path": "/b", "id": %d}]' % big_id,
+        b'{"path": "/a", "id": 1}\n{"path": "/b", "id": %d}\n' % big_id,
+    ):
+        file_path = _write(content)
+        output_dir = tempfile.mkdtemp()
+        try:
+            # Every reader keeps the exact integer rather than rounding it to a float
+            assert [entry["id"] for entry in _iter_entries(file_path)] == [1, big_id]
+            assert [entry["id"] for entry in read_large_file_part(file_path)["entries"]] == [1, big_id]
+            
+            # And it survives being saved and read back
+            result = parse_and_save_charles_log(file_path, output_dir, "raw")
+            with open(result["output_file"]) as f:
+                assert [entry["id"] for entry in json.load(f)["entries"]] == [1, big_id]
+        finally:
+            os.remove(file_path)
+            for name in os.listdir(output_dir):
+                os.remove(os.path.join(output_dir, name))
+            os.rmdir(output_dir)
+
+def test_truncated_array():
+    entries, summary = _entries_and_summary(b'[{"path": "/a"},\n{"path": "/b"},\n{"path": "/c"')
+    
+    # With ijson the complete entries before the cut are streamed; without it the
+    # line-by-line fallback cannot parse the comma-terminated lines of an array
+    assert [entry["path"] for entry in entries] == (["/a", "/b"] if server.ijson is not None else [])
+    assert "error" not in summary
+
+def test_content_type_header_case():
+    for name in ("Content-Type", "content-type", "CONTENT-TYPE", "Content-type"):
+        # Dict headers and list headers find the same header whatever its spelling
+        assert _content_type({"headers": {name: ["application/json"]}}) == "application/json"
+        assert _content_type({"headers": [{"name": name, "value": "application/json"}]}) == "application/json"
+    assert _content_type({"headers": {"Accept": ["*/*"]}}) == "UNKNOWN"
+
+if __name__ == "__main__":
+    test_array_with_nan()
+    test_array_with_big_int()
+    test_big_int_round_trip()
+    test_truncated_array()
+    test_content_type_header_case()
+    print("All parsing tests passed")